@@ -25,10 +25,8 @@ except:
     title_font = ImageFont.load_default()
     text_font = ImageFont.load_default()
 
-def draw_table(image, title, data, x_offset, y_offset, col_widths):
-    """Draw a table on the image"""
-    draw = ImageDraw.Draw(image)
-    
+def draw_table(draw, title, data, x_offset, y_offset, col_widths):
+    """Draw a table with the given draw object"""
     # Draw title
     draw.text((x_offset, y_offset - 30), title, fill=TEXT_COLOR, font=title_font)
     
@@ -76,22 +74,24 @@ def draw_table(image, title, data, x_offset, y_offset, col_widths):
             )
             current_x += width
 
+# Arrow sprite (shaft + head) rendered once at module load; frames paste it
+# as a single blit instead of re-rasterizing the rectangle and polygon
+ARROW_SPRITE = Image.new('RGBA', (76, 31), (0, 0, 0, 0))
+_sprite_draw = ImageDraw.Draw(ARROW_SPRITE)
+_sprite_draw.rectangle([0, 10, 60, 20], fill=ARROW_COLOR)
+_sprite_draw.polygon([(60, 0), (60, 30), (75, 15)], fill=ARROW_COLOR)
+
 def draw_arrow(image, x, y):
-    """Draw a large arrow pointing right"""
-    draw = ImageDraw.Draw(image)
-    arrow_length = 60
-    
-    # Arrow shaft
-    draw.rectangle(
-        [x, y - 5, x + arrow_length, y + 5],
-        fill=ARROW_COLOR
-    )
-    
-    # Arrow head (triangle)
-    draw.polygon(
-        [(x + arrow_length, y - 15), (x + arrow_length, y + 15), (x + arrow_length + 15, y)],
-        fill=ARROW_COLOR
-    )
+    """Paste the pre-rendered right-pointing arrow sprite"""
+    image.paste(ARROW_SPRITE, (x, y - 15), ARROW_SPRITE)
+
+def quantize_frame(image):
+    """Convert a frame to 64-colour palette mode so the GIF export skips re-quantizing it"""
+    try:
+        return image.quantize(colors=64, method=Image.Quantize.LIBIMAGEQUANT)
+    except (AttributeError, ValueError):
+        # libimagequant not compiled into this Pillow build
+        return image.quantize(colors=64)
 
 def create_animation():
     """Create animated GIF"""
@@ -117,37 +117,44 @@ def create_animation():
     
     col_widths_input = [120, 120, 120]
     col_widths_output = [100, 100, 100, 100]
-    
+
+    # Render each distinct base image once; frames that repeat it are cheap copies
+    input_base = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
+    draw_table(ImageDraw.Draw(input_base), "INPUT: Raw CSV Data (Multiple rows per tower)", input_data, 50, 100, col_widths_input)
+
+    output_base = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
+    draw_table(ImageDraw.Draw(output_base), "OUTPUT: Aggregated & Formatted Data", output_data, 50, 100, col_widths_output)
+
+    both_base = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
+    both_draw = ImageDraw.Draw(both_base)
+    draw_table(both_draw, "INPUT", input_data, 30, 100, [80, 80, 80])
+    draw_arrow(both_base, 300, 170)
+    draw_table(both_draw, "OUTPUT", output_data, 420, 100, [80, 70, 70, 70])
+
+    # Quantize each base once; the hold frames are then palette-mode copies
+    input_base_p = quantize_frame(input_base)
+    output_base_p = quantize_frame(output_base)
+    both_base_p = quantize_frame(both_base)
+
     # Frame 1: Show input table (hold for 2 seconds = 20 frames at 100ms)
-    for _ in range(20):
-        img = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
-        draw_table(img, "INPUT: Raw CSV Data (Multiple rows per tower)", input_data, 50, 100, col_widths_input)
-        frames.append(img)
-    
+    frames.extend([input_base_p.copy() for _ in range(20)])
+
     # Frame 2: Show input + animated arrow (10 frames for arrow animation)
     for i in range(10):
-        img = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
-        draw_table(img, "INPUT: Raw CSV Data (Multiple rows per tower)", input_data, 50, 100, col_widths_input)
-        
+        img = input_base.copy()
+
         # Animated arrow moving right
         arrow_x = 350 + (i * 4)
         draw_arrow(img, arrow_x, 170)
-        
-        frames.append(img)
-    
+
+        # Quantized individually so the arrow colour stays in the palette
+        frames.append(quantize_frame(img))
+
     # Frame 3: Show output table (hold for 2 seconds)
-    for _ in range(20):
-        img = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
-        draw_table(img, "OUTPUT: Aggregated & Formatted Data", output_data, 50, 100, col_widths_output)
-        frames.append(img)
-    
+    frames.extend([output_base_p.copy() for _ in range(20)])
+
     # Frame 4: Both tables with arrow (final frame, hold for 3 seconds)
-    for _ in range(30):
-        img = Image.new('RGB', (FRAME_WIDTH, FRAME_HEIGHT), BG_COLOR)
-        draw_table(img, "INPUT", input_data, 30, 100, [80, 80, 80])
-        draw_arrow(img, 300, 170)
-        draw_table(img, "OUTPUT", output_data, 420, 100, [80, 70, 70, 70])
-        frames.append(img)
+    frames.extend([both_base_p.copy() for _ in range(30)])
     
     # Save as GIF
     output_file = "transformation_animation.gif"
@@ -7,14 +7,74 @@
 
 
 
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook, Workbook
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import xlsxwriter
 from openpyxl.styles import PatternFill, Font
 import os
 
-def process_company_data(input_csv, company_name, licensee_name, province, sheet_name, workbook_name):
-    """Process one company CSV file and add a formatted worksheet to the given Excel workbook."""
-    
+# Immutable header styles, built once per process. xlsxwriter formats belong to a
+# workbook, so for that writer only the spec dict lives here.
+HEADER_FILL = PatternFill(start_color="FF002060", end_color="FF002060", fill_type="solid")  # dark blue
+HEADER_FONT = Font(color="FFFFFF", bold=True)
+HEADER_FORMAT = {'bg_color': '#002060', 'font_color': '#FFFFFF', 'bold': True}
+
+# Numba is optional - it only pays off once a single company CSV reaches
+# millions of rows, so the pandas path below stays as the fallback
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# joblib is optional too - it threads the per-column string joins on large inputs
+try:
+    from joblib import Parallel, delayed
+except ImportError:
+    Parallel = None
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _sum_bandwidth_buckets(group_codes, tech_codes, bandwidth, n_groups, lte_code, g5_code):
+        """Accumulate per-group LTE and 5G bandwidth sums in one linear scan."""
+        out_4g = np.zeros(n_groups, np.float64)
+        out_5g = np.zeros(n_groups, np.float64)
+        for i in range(group_codes.size):
+            g = group_codes[i]
+            if g < 0 or tech_codes[i] < 0 or np.isnan(bandwidth[i]):
+                # missing record_id, technology or bandwidth; groupby-sum skips
+                # these too, and a null tech code must not match a missing-bucket
+                # sentinel of -1
+                continue
+            if tech_codes[i] == lte_code:
+                out_4g[g] += bandwidth[i]
+            elif tech_codes[i] == g5_code:
+                out_5g[g] += bandwidth[i]
+        return out_4g, out_5g
+
+
+def optimize_memory(df):
+    """Shrink the frame in place: downcast integer columns and categorise low-cardinality string columns.
+
+    Float columns are left at their parsed width on purpose - downcasting them to
+    float32 changes how values render in the ~-joined output strings (44.8 becomes
+    44.79999923706055) and nudges the exported coordinates.
+    """
+    category_cols = ['record_id', 'technology', 'licence_category*', 'area_name*']
+    for col in df.columns:
+        if col in category_cols:
+            df[col] = df[col].astype('category')
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def build_company_frame(input_csv, licensee_name, province, sheet_name):
+    """Read one company CSV file and return (sheet_name, processed DataFrame)."""
+
     # Define column mappings and settings
     use_cols = ["Tier-4 id", "record_id", "area_name*", "latitude", "longitude",
                 "structure_height", "tx_ant_azimuth", "licence_category*",
@@ -23,32 +83,86 @@ def process_company_data(input_csv, company_name, licensee_name, province, sheet
     group_repeated_values = ['licence_category*', 'tx_ant_azimuth', 'technology', 'bandwidth', 'tx_power']
     name_groupby = 'record_id'
 
-    # Read input CSV
-    df = pd.read_csv(input_csv, usecols=use_cols)
-
-    # Group and aggregate
-    results = []
-    for group_name, group_df in df.groupby(name_groupby):
-        row_result = {name_groupby: group_name}
-        for col in group_unique_values:
-            row_result[col] = group_df.iloc[0][col]
-        for col in group_repeated_values:
-            row_result[col] = '~'.join(group_df[col].astype(str).tolist())
-
-        # Initialize accumulators
-        row_result['4G_BW'] = 0
-        row_result['5G_BW'] = 0
-        for _, row in group_df.iterrows():
-            tech = str(row['technology'])
-            bw = float(row['bandwidth'])
-            if tech == 'LTE':
-                row_result['4G_BW'] += bw
-            elif tech == '5G':
-                row_result['5G_BW'] += bw 
-
-        results.append(row_result)
-
-    results = pd.DataFrame(results) #to be printed in the excel
+    # Read input CSV straight through Arrow: include_columns drops the ~50 unused
+    # columns during tokenization and the pinned types skip inference for them.
+    # The measure columns (heights, azimuths, powers, bandwidths) stay inferred so
+    # integer-valued files keep their integer rendering in the ~-joined strings.
+    column_types = {
+        'Tier-4 id': pa.string(),
+        'record_id': pa.string(),
+        'area_name*': pa.string(),
+        'licence_category*': pa.string(),
+        'technology': pa.string(),
+        'latitude': pa.float64(),
+        'longitude': pa.float64(),
+    }
+    table = pa_csv.read_csv(
+        input_csv,
+        convert_options=pa_csv.ConvertOptions(include_columns=use_cols,
+                                              column_types=column_types,
+                                              strings_can_be_null=True))
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    df = optimize_memory(df)
+
+    # Pre-sorting makes each group's rows contiguous, so the grouped scans below
+    # can run with sort=False and stay cache-friendly
+    df = df.sort_values(name_groupby, kind='stable', ignore_index=True)
+
+    # Group and aggregate in two vectorized scans: one agg pass over all kept
+    # columns, one masked sum for the bandwidth buckets.
+    # licence_category* is joined straight into its final '|'-separated SERVICES
+    # form, which saves a full-column replace later on
+    join_seps = {col: '~' for col in group_repeated_values}
+    join_seps['licence_category*'] = '|'
+    unique_spec = {col: 'first' for col in group_unique_values if col != name_groupby}
+    grouped = df.groupby(name_groupby, sort=False, observed=True)
+
+    # na_rep keeps one entry per source row, so the joined columns stay
+    # positionally aligned with each other even when a cell is missing
+    def join_column(col, sep):
+        return grouped[col].agg(lambda s: s.astype(str).str.cat(sep=sep, na_rep='nan'))
+
+    if Parallel is not None:
+        # The five joins are independent group-wise reductions, so run them on
+        # threads; the Excel-bound frames are joined back up by index
+        repeated_parts = Parallel(n_jobs=min(len(join_seps), os.cpu_count() or 1),
+                                  backend='threading')(
+            delayed(join_column)(col, sep) for col, sep in join_seps.items())
+        base_part = pd.concat([grouped.agg(unique_spec)] + repeated_parts, axis=1)
+    else:
+        agg_spec = dict(unique_spec)
+        agg_spec.update({col: (lambda s, sep=sep: s.astype(str).str.cat(sep=sep, na_rep='nan'))
+                         for col, sep in join_seps.items()})
+        base_part = grouped.agg(agg_spec)
+
+    if numba is not None:
+        # One cache-friendly scan over the category codes at ~C speed
+        group_cats = df[name_groupby].cat.categories
+        tech_cats = df['technology'].cat.categories
+        out_4g, out_5g = _sum_bandwidth_buckets(
+            df[name_groupby].cat.codes.to_numpy(np.int64),
+            df['technology'].cat.codes.to_numpy(np.int64),
+            df['bandwidth'].to_numpy(np.float64),
+            len(group_cats),
+            tech_cats.get_loc('LTE') if 'LTE' in tech_cats else -1,
+            tech_cats.get_loc('5G') if '5G' in tech_cats else -1,
+        )
+        bw_part = pd.DataFrame({'4G_BW': out_4g, '5G_BW': out_5g}, index=group_cats)
+        if pd.api.types.is_integer_dtype(df['bandwidth']):
+            # exact in the float64 accumulators, so keep the cells integer
+            bw_part = bw_part.astype(np.int64)
+    else:
+        # One hash-groupby over the category codes; the reindex guarantees both
+        # buckets exist even when a company has no rows for one technology, and
+        # restores groups the pivot drops when all their technology cells are
+        # null, so they get 0 sums like the numba path
+        bw_part = (df.pivot_table(index=name_groupby, columns='technology',
+                                  values='bandwidth', aggfunc='sum',
+                                  observed=True, fill_value=0)
+                     .reindex(index=base_part.index, columns=['LTE', '5G'], fill_value=0)
+                     .rename(columns={'LTE': '4G_BW', '5G': '5G_BW'}))
+
+    results = base_part.join(bw_part).reset_index() #to be printed in the excel
 
     # Rename columns to destination names
     results = results.rename(columns={
@@ -68,70 +182,86 @@ def process_company_data(input_csv, company_name, licensee_name, province, sheet
     results["Name"] = ' '
     results["Province"] = province
     results["Licensee"] = licensee_name
-    results["Type"] = results["Height (m)"].apply(lambda x: 'Micro' if x < 10 else 'Macro')
-    results["Micro"] = results["Type"].apply(lambda x: 1 if x == 'Micro' else '-')
-    results["Macro"] = results["Type"].apply(lambda x: 1 if x == 'Macro' else '-')
-    results["SERVICES"] = results["SERVICES"].str.replace("~", "|")
+    is_micro = results["Height (m)"].to_numpy() < 10
+    results["Type"] = np.where(is_micro, 'Micro', 'Macro')
+    micro_flag = np.full(len(results), '-', dtype=object)
+    micro_flag[is_micro] = 1
+    macro_flag = np.full(len(results), '-', dtype=object)
+    macro_flag[~is_micro] = 1
+    results["Micro"] = micro_flag
+    results["Macro"] = macro_flag
     results["TECHNOLOGY"] = results["TECHNOLOGY"].str.replace("LTE", "4G")
 
     # Reorder columns
     final_columns = ["Code", "Name", "Province", "Tower ID", "Licensee", "LATITUDE", "LONGITUDE",
                      "Height (m)", "Type", "Micro", "Macro", "TX_ANT_AZI", "SERVICES",
                      "TECHNOLOGY", "TR_BW_BLOCS", "4G_BW", "5G_BW", "TX_PWR"]
-    results = results[final_columns].copy()
+    results = results[final_columns]
+
+    return sheet_name, results
+
 
-    # Append or create workbook
+def write_sheet(workbook_name, sheet_name, results):
+    """Add one processed DataFrame as a formatted worksheet of the given Excel workbook."""
+
+    # Append or create workbook, styling the header before the single save
     if os.path.exists(workbook_name):
-        with pd.ExcelWriter(workbook_name, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
-            results.to_excel(writer, index=False, sheet_name=sheet_name)
+        writer_args = {"mode": "a", "if_sheet_exists": "replace"}
     else:
-        with pd.ExcelWriter(workbook_name, engine="openpyxl") as writer:
-            results.to_excel(writer, index=False, sheet_name=sheet_name)
+        writer_args = {}
+    with pd.ExcelWriter(workbook_name, engine="openpyxl", **writer_args) as writer:
+        results.to_excel(writer, index=False, sheet_name=sheet_name)
+        ws = writer.sheets[sheet_name]
+        for cell in ws[1]:
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+
+    print(f"✅ Added worksheet '{sheet_name}' to {workbook_name}")
 
-    # Apply styling
-    wb = load_workbook(workbook_name)
-    ws = wb[sheet_name]
-    header_fill = PatternFill(start_color="002060", end_color="002060", fill_type="solid")  # dark blue
-    header_font = Font(color="FFFFFF", bold=True)
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-    wb.save(workbook_name)
 
-    print(f"✅ Added worksheet '{sheet_name}' for {company_name} to {workbook_name}")
+def write_workbook(workbook_name, sheets):
+    """Stream all processed DataFrames into a fresh workbook with constant memory."""
+    wb = xlsxwriter.Workbook(workbook_name, {'constant_memory': True})
+    header_fmt = wb.add_format(HEADER_FORMAT)
+
+    for sheet_name, results in sheets:
+        # xlsxwriter rejects pd.NA/NaN cells; None becomes a blank cell, like
+        # the na_rep='' the to_excel path wrote
+        results = results.astype(object).where(results.notna(), None)
+        ws = wb.add_worksheet(sheet_name)
+        ws.write_row(0, 0, list(results.columns), header_fmt)
+        for row_num, row in enumerate(results.itertuples(index=False, name=None), start=1):
+            ws.write_row(row_num, 0, row)
+
+    wb.close()
+    print(f"✅ Wrote {len(sheets)} worksheets to {workbook_name}")
+
+
+def process_company_data(input_csv, company_name, licensee_name, province, sheet_name, workbook_name):
+    """Process one company CSV file and add a formatted worksheet to the given Excel workbook."""
+    sheet_name, results = build_company_frame(input_csv, licensee_name, province, sheet_name)
+    write_sheet(workbook_name, sheet_name, results)
 
 
 ################################################################            main           ################################################################
 
-output_workbook = "Telecom_Data_format2.xlsx"
-
-process_company_data(
-    input_csv="Rogers sectors v3 Final.csv",
-    company_name="Rogers",
-    licensee_name="Rogers Communications Canada Inc.",
-    province="QC",
-    sheet_name="Rogers",
-    workbook_name=output_workbook
-)
-
-process_company_data(
-    input_csv="TELUS sectors v3 Final.csv",
-    company_name="TELUS",
-    licensee_name="TELUS",
-    province="QC",
-    sheet_name="TELUS",
-    workbook_name=output_workbook
-)
-
-
-process_company_data(
-    input_csv="Videotron sectors v3 Final.csv",
-    company_name="Videotron",
-    licensee_name="Videotron.",
-    province="QC",
-    sheet_name="Videotron",
-    workbook_name=output_workbook
-)
+if __name__ == "__main__":
+    output_workbook = "Telecom_Data_format2.xlsx"
+
+    # (input_csv, licensee_name, province, sheet_name)
+    jobs = [
+        ("Rogers sectors v3 Final.csv", "Rogers Communications Canada Inc.", "QC", "Rogers"),
+        ("TELUS sectors v3 Final.csv", "TELUS", "QC", "TELUS"),
+        ("Videotron sectors v3 Final.csv", "Videotron.", "QC", "Videotron"),
+    ]
+
+    # Build the three frames in parallel, then serialize the workbook once in this process
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [executor.submit(build_company_frame, *job) for job in jobs]
+        # Collect in submit order so the workbook keeps a deterministic sheet order
+        sheets = [future.result() for future in futures]
+
+    write_workbook(output_workbook, sheets)
 
 
 